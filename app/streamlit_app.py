@@ -4,17 +4,10 @@ Built with Streamlit for interactive analysis
 """
 
 import streamlit as st
+import asyncio
 import sys
 import os
 
-# Download spaCy model if not available
-try:
-    import spacy
-    spacy.load('en_core_web_sm')
-except:
-    import subprocess
-    subprocess.run(['python', '-m', 'spacy', 'download', 'en_core_web_sm'], check=False)
-
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
@@ -41,9 +34,51 @@ def load_models():
     cuisine_classifier = CuisineClassifier()
     entity_recognizer = EntityRecognizer()
     
+    # Load TextBlob's lazily loaded lexicon now, before reviews are
+    # analyzed from several threads at once
+    sentiment_analyzer.analyze("warm up")
+    
     return sentiment_analyzer, aspect_detector, cuisine_classifier, entity_recognizer
 
 
+@st.cache_data
+def get_sample_reviews():
+    """Sample reviews for the sample picker (cached across reruns)"""
+    return load_sample_reviews()
+
+
+async def _run_all(text: str) -> dict:
+    """Run the independent analyzers concurrently in worker threads"""
+    sentiment_analyzer, aspect_detector, cuisine_classifier, entity_recognizer = load_models()
+    
+    results = await asyncio.gather(
+        asyncio.to_thread(sentiment_analyzer.analyze, text),
+        asyncio.to_thread(aspect_detector.extract_aspects, text),
+        asyncio.to_thread(cuisine_classifier.classify, text),
+        asyncio.to_thread(cuisine_classifier.get_all_scores, text),
+        asyncio.to_thread(entity_recognizer.extract_entities, text)
+    )
+    
+    keys = ['sentiment', 'aspects', 'cuisine', 'cuisine_scores', 'entities']
+    results = dict(zip(keys, results))
+    
+    # Derive the summary from the full breakdown instead of re-extracting
+    results['aspect_summary'] = {
+        aspect: data['sentiment']
+        for aspect, data in results['aspects'].items()
+        if data['mentioned']
+    }
+    return results
+
+
+# Cached on the cleaned review text, so reruns triggered by widget
+# interactions don't repeat the NLP work
+@st.cache_data(max_entries=128)
+def analyze_review(text: str) -> dict:
+    """Run every analysis on a review"""
+    return asyncio.run(_run_all(text))
+
+
 def main():
     """Main application"""
     
@@ -56,7 +91,7 @@ def main():
     
     # Load models
     with st.spinner("Loading NLP models..."):
-        sentiment_analyzer, aspect_detector, cuisine_classifier, entity_recognizer = load_models()
+        load_models()
     
     # Sidebar
     st.sidebar.header("⚙️ Settings")
@@ -88,7 +123,7 @@ def main():
             )
         else:
             # Load sample reviews
-            samples = load_sample_reviews()
+            samples = get_sample_reviews()
             sample_options = [f"Sample {i+1}: {s['cuisine']}" for i, s in enumerate(samples)]
             selected_sample = st.selectbox("Choose a sample review:", sample_options)
             sample_idx = int(selected_sample.split()[1].replace(':', '')) - 1
@@ -119,6 +154,19 @@ def main():
         
         # Clean text
         cleaned_text = clean_text(review_text)
+        text_hash = hash(cleaned_text)
+        
+        # Only re-analyze when the text changed since the last analysis
+        if st.session_state.get('text_hash') != text_hash:
+            with st.spinner("Analyzing review..."):
+                st.session_state['results'] = analyze_review(cleaned_text)
+            st.session_state['text_hash'] = text_hash
+        st.session_state['review_text'] = review_text
+    
+    # Keep showing the last results across reruns (checkbox toggles, tab
+    # clicks) until the review itself changes
+    if 'results' in st.session_state and st.session_state.get('review_text') == review_text:
+        results = st.session_state['results']
         
         # Create tabs for results
         tabs = st.tabs(["📊 Overview", "🔍 Detailed Analysis", "📈 Statistics"])
@@ -128,9 +176,8 @@ def main():
             
             # Sentiment Analysis
             if show_sentiment:
-                with st.spinner("Analyzing sentiment..."):
-                    sentiment_result = sentiment_analyzer.analyze(cleaned_text)
-                    
+                sentiment_result = results['sentiment']
+                
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
@@ -143,8 +190,7 @@ def main():
                 
                 # Cuisine Classification
                 if show_cuisine:
-                    with st.spinner("Classifying cuisine..."):
-                        cuisine_result = cuisine_classifier.classify(cleaned_text)
+                    cuisine_result = results['cuisine']
                     
                     with col2:
                         emoji = get_cuisine_emoji(cuisine_result['cuisine'])
@@ -156,9 +202,8 @@ def main():
                 
                 # Entity count
                 if show_entities:
-                    with st.spinner("Extracting entities..."):
-                        entities = entity_recognizer.extract_entities(cleaned_text)
-                        total_entities = sum(len(v) for v in entities.values())
+                    entities = results['entities']
+                    total_entities = sum(map(len, entities.values()))
                     
                     with col3:
                         st.metric(
@@ -171,8 +216,7 @@ def main():
             if show_aspects:
                 st.subheader("🎯 Aspect-Based Analysis")
                 
-                with st.spinner("Analyzing aspects..."):
-                    aspects = aspect_detector.get_summary(cleaned_text)
+                aspects = results['aspect_summary']
                 
                 if aspects:
                     cols = st.columns(len(aspects))
@@ -195,12 +239,12 @@ def main():
             # Sentiment Details
             if show_sentiment:
                 st.markdown("### 😊 Sentiment Analysis")
-                st.json(sentiment_result)
+                st.json(results['sentiment'])
             
             # Aspect Details
             if show_aspects:
                 st.markdown("### 🎯 Aspect Details")
-                full_aspects = aspect_detector.extract_aspects(cleaned_text)
+                full_aspects = results['aspects']
                 
                 for aspect, data in full_aspects.items():
                     if data['mentioned']:
@@ -212,7 +256,7 @@ def main():
             # Cuisine Details
             if show_cuisine:
                 st.markdown("### 🍽️ Cuisine Classification")
-                all_scores = cuisine_classifier.get_all_scores(cleaned_text)
+                all_scores = results['cuisine_scores']
                 if all_scores:
                     st.bar_chart(all_scores)
                 else:
@@ -222,6 +266,7 @@ def main():
             if show_entities:
                 st.markdown("### 📝 Extracted Entities")
                 
+                entities = results['entities']
                 if any(entities.values()):
                     for entity_type, entity_list in entities.items():
                         if entity_list:
@@ -233,20 +278,21 @@ def main():
         with tabs[2]:  # Statistics
             st.subheader("Review Statistics")
             
+            words = review_text.split()
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Word Count", len(review_text.split()))
+                st.metric("Word Count", len(words))
             
             with col2:
                 st.metric("Character Count", len(review_text))
             
             with col3:
-                sentences = review_text.count('.') + review_text.count('!') + review_text.count('?')
+                sentences = sum(map(review_text.count, '.!?'))
                 st.metric("Sentences", max(1, sentences))
             
             with col4:
-                avg_word_length = sum(len(word) for word in review_text.split()) / max(1, len(review_text.split()))
+                avg_word_length = sum(map(len, words)) / max(1, len(words))
                 st.metric("Avg Word Length", f"{avg_word_length:.1f}")
     
     # Footer
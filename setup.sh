@@ -1,8 +1,7 @@
 #!/bin/bash
 
-# Download spaCy model for English
-python -m spacy download en_core_web_sm --quiet
+# The spaCy model is installed from requirements.txt, so nothing is
+# downloaded for it at boot
 
 # Download NLTK data
 python -c "import nltk; nltk.download('punkt', quiet=True); nltk.download('stopwords', quiet=True)"
-
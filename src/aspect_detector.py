@@ -4,9 +4,58 @@ Extracts opinions about specific aspects: food, service, ambiance, price
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, List
-import spacy
-from textblob import TextBlob
+import ahocorasick
+import pandas as pd
+from textblob.en import sentiment as pattern_sentiment
+
+
+# Maps every sentence terminator to '.' so reviews split with str.split
+_SENT_TRANS = str.maketrans({'!': '.', '?': '.'})
+
+# Keywords that signal each aspect (expanded and improved)
+ASPECT_KEYWORDS = {
+    'food': [
+        'food', 'dish', 'meal', 'taste', 'flavor', 'flavour', 'delicious', 'tasty',
+        'menu', 'cuisine', 'recipe', 'ingredient', 'fresh', 'quality',
+        'burger', 'pizza', 'pasta', 'salad', 'dessert', 'appetizer',
+        'entree', 'chicken', 'beef', 'fish', 'vegetable', 'spicy', 'sweet',
+        'bland', 'flavorless', 'stale', 'cold', 'overcooked', 'undercooked',
+        'juicy', 'tender', 'crispy', 'soggy', 'burnt', 'raw'
+    ],
+    'service': [
+        'service', 'staff', 'waiter', 'waitress', 'server', 'manager',
+        'friendly', 'rude', 'attentive', 'slow', 'fast', 'professional',
+        'helpful', 'employee', 'personnel', 'team', 'wait', 'serve',
+        'ignored', 'forgot', 'efficient', 'courteous', 'polite', 'impolite'
+    ],
+    'ambiance': [
+        'ambiance', 'atmosphere', 'decor', 'environment', 'vibe', 'mood',
+        'cozy', 'romantic', 'loud', 'quiet', 'clean', 'dirty', 'lighting',
+        'music', 'seating', 'interior', 'decoration', 'place', 'setting',
+        'spacious', 'cramped', 'elegant', 'tacky', 'modern', 'outdated'
+    ],
+    'price': [
+        'price', 'expensive', 'cheap', 'affordable', 'value', 'cost',
+        'worth', 'overpriced', 'reasonable', 'budget', 'money', 'bill',
+        'pricey', 'inexpensive', 'deal', 'discount', 'waste'
+    ]
+}
+
+# Negative indicators for better detection
+NEGATIVE_WORDS = [
+    'not', 'no', 'never', 'terrible', 'horrible', 'awful', 'bad', 'worst',
+    'disappointing', 'poor', 'rude', 'slow', 'cold', 'stale', 'bland',
+    'overpriced', 'expensive', 'waste', 'dirty', 'loud', 'cramped'
+]
+
+# Positive indicators
+POSITIVE_WORDS = [
+    'great', 'excellent', 'amazing', 'fantastic', 'wonderful', 'perfect',
+    'delicious', 'best', 'love', 'loved', 'good', 'nice', 'fresh',
+    'friendly', 'attentive', 'cozy', 'beautiful', 'worth'
+]
 
 
 class AspectDetector:
@@ -14,44 +63,83 @@ class AspectDetector:
     Detects and analyzes sentiment for specific aspects of restaurant reviews
     """
     
+    __slots__ = (
+        'aspect_keywords', 'keyword_automaton', 'aspect_patterns',
+        'negative_words', 'positive_words', 'cue_automaton'
+    )
+    
     def __init__(self):
         """Initialize aspect detector with keyword dictionaries"""
         
-        # Define aspect keywords (expanded and improved)
-        self.aspect_keywords = {
-            'food': [
-                'food', 'dish', 'meal', 'taste', 'flavor', 'flavour', 'delicious', 'tasty',
-                'menu', 'cuisine', 'recipe', 'ingredient', 'fresh', 'quality',
-                'burger', 'pizza', 'pasta', 'salad', 'dessert', 'appetizer',
-                'entree', 'chicken', 'beef', 'fish', 'vegetable', 'spicy', 'sweet',
-                'bland', 'flavorless', 'stale', 'cold', 'overcooked', 'undercooked',
-                'juicy', 'tender', 'crispy', 'soggy', 'burnt', 'raw'
-            ],
-            'service': [
-                'service', 'staff', 'waiter', 'waitress', 'server', 'manager',
-                'friendly', 'rude', 'attentive', 'slow', 'fast', 'professional',
-                'helpful', 'employee', 'personnel', 'team', 'wait', 'serve',
-                'ignored', 'forgot', 'efficient', 'courteous', 'polite', 'impolite'
-            ],
-            'ambiance': [
-                'ambiance', 'atmosphere', 'decor', 'environment', 'vibe', 'mood',
-                'cozy', 'romantic', 'loud', 'quiet', 'clean', 'dirty', 'lighting',
-                'music', 'seating', 'interior', 'decoration', 'place', 'setting',
-                'spacious', 'cramped', 'elegant', 'tacky', 'modern', 'outdated'
-            ],
-            'price': [
-                'price', 'expensive', 'cheap', 'affordable', 'value', 'cost',
-                'worth', 'overpriced', 'reasonable', 'budget', 'money', 'bill',
-                'pricey', 'inexpensive', 'deal', 'discount', 'waste'
-            ]
+        # Keyword tables are shared module constants, not rebuilt per instance
+        self.aspect_keywords = ASPECT_KEYWORDS
+        self.negative_words = NEGATIVE_WORDS
+        self.positive_words = POSITIVE_WORDS
+        
+        # Compile all aspect keywords into a single Aho-Corasick automaton
+        keyword_aspects = {}
+        for aspect, keywords in self.aspect_keywords.items():
+            for keyword in keywords:
+                keyword_aspects.setdefault(keyword, []).append(aspect)
+        
+        self.keyword_automaton = ahocorasick.Automaton()
+        for keyword, aspects in keyword_aspects.items():
+            self.keyword_automaton.add_word(keyword, tuple(aspects))
+        self.keyword_automaton.make_automaton()
+        
+        # One alternation regex per aspect for vectorized batch detection
+        self.aspect_patterns = {
+            aspect: re.compile('|'.join(map(re.escape, keywords)))
+            for aspect, keywords in self.aspect_keywords.items()
+        }
+        
+        # Cue words share one automaton; each hit reports its polarity
+        self.cue_automaton = ahocorasick.Automaton()
+        for word in self.negative_words:
+            self.cue_automaton.add_word(word, 'negative')
+        for word in self.positive_words:
+            self.cue_automaton.add_word(word, 'positive')
+        self.cue_automaton.make_automaton()
+    
+    def _split_sentences(self, text: str) -> List[str]:
+        """Lowercase the text once and split it into non-empty sentences"""
+        sentences = [s.strip() for s in text.lower().translate(_SENT_TRANS).split('.')]
+        return [s for s in sentences if s]
+    
+    def _sentence_aspects(self, sentence: str) -> set:
+        """Find every aspect a sentence mentions in one automaton pass"""
+        return {
+            aspect
+            for _, aspects in self.keyword_automaton.iter(sentence)
+            for aspect in aspects
         }
+    
+    def _sentence_polarity(self, sentence: str) -> float:
+        """Polarity of a lowercased sentence, adjusted by cue words"""
+        # Check for negative and positive words in a single pass
+        cues = {polarity for _, polarity in self.cue_automaton.iter(sentence)}
+        
+        # Calculate polarity with word-based adjustment, scoring with
+        # TextBlob's pattern lexicon directly instead of building a blob
+        polarity = pattern_sentiment(sentence)[0]
         
-        # Try to load spaCy model
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
-        except:
-            print("⚠️  spaCy model not found. Install with: python -m spacy download en_core_web_sm")
-            self.nlp = None
+        # Boost detection based on keywords
+        if 'negative' in cues and polarity > -0.3:
+            polarity = -0.5
+        if 'positive' in cues and polarity < 0.3:
+            polarity = 0.5
+        
+        return polarity
+    
+    def _polarity_label(self, avg_polarity: float) -> str:
+        """Map an average polarity to a sentiment label"""
+        # More sensitive thresholds
+        if avg_polarity > 0.15:
+            return 'positive'
+        elif avg_polarity < -0.15:
+            return 'negative'
+        else:
+            return 'neutral'
     
     def extract_aspect_sentences(self, text: str) -> Dict[str, List[str]]:
         """
@@ -63,16 +151,11 @@ class AspectDetector:
         Returns:
             Dictionary mapping aspects to relevant sentences
         """
-        # Split into sentences
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip().lower() for s in sentences if s.strip()]
-        
         aspect_sentences = {aspect: [] for aspect in self.aspect_keywords}
         
-        for sentence in sentences:
-            for aspect, keywords in self.aspect_keywords.items():
-                if any(keyword in sentence for keyword in keywords):
-                    aspect_sentences[aspect].append(sentence)
+        for sentence in self._split_sentences(text):
+            for aspect in self._sentence_aspects(sentence):
+                aspect_sentences[aspect].append(sentence)
         
         return aspect_sentences
     
@@ -81,7 +164,7 @@ class AspectDetector:
         Determine overall sentiment for an aspect based on its sentences
         
         Args:
-            sentences: List of sentences about the aspect
+            sentences: List of lowercased sentences about the aspect
             
         Returns:
             Sentiment: positive, negative, or neutral
@@ -89,49 +172,46 @@ class AspectDetector:
         if not sentences:
             return 'not mentioned'
         
-        # Negative indicators for better detection
-        negative_words = [
-            'not', 'no', 'never', 'terrible', 'horrible', 'awful', 'bad', 'worst',
-            'disappointing', 'poor', 'rude', 'slow', 'cold', 'stale', 'bland',
-            'overpriced', 'expensive', 'waste', 'dirty', 'loud', 'cramped'
-        ]
-        
-        # Positive indicators
-        positive_words = [
-            'great', 'excellent', 'amazing', 'fantastic', 'wonderful', 'perfect',
-            'delicious', 'best', 'love', 'loved', 'good', 'nice', 'fresh',
-            'friendly', 'attentive', 'cozy', 'beautiful', 'worth'
-        ]
-        
-        polarities = []
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            
-            # Check for negative words
-            has_negative = any(word in sentence_lower for word in negative_words)
-            has_positive = any(word in sentence_lower for word in positive_words)
+        polarities = [self._sentence_polarity(sentence) for sentence in sentences]
+        return self._polarity_label(sum(polarities) / len(polarities))
+    
+    @lru_cache(maxsize=256)
+    def _analyze_aspects(self, text: str) -> tuple:
+        """
+        Match and score every aspect of a review (memoized per text)
+        
+        Sentences are matched and scored in a single pass, so a sentence
+        mentioning several aspects is only scored once. The cached result
+        is built from tuples so callers can never modify it.
+        
+        Args:
+            text: Review text
             
-            # Calculate polarity with word-based adjustment
-            blob = TextBlob(sentence)
-            polarity = blob.sentiment.polarity
+        Returns:
+            Tuple of (aspect, sentiment, sentences) for every aspect
+        """
+        aspect_sentences = {aspect: [] for aspect in self.aspect_keywords}
+        polarity_sums = dict.fromkeys(self.aspect_keywords, 0.0)
+        
+        for sentence in self._split_sentences(text):
+            hits = self._sentence_aspects(sentence)
+            if not hits:
+                continue
             
-            # Boost detection based on keywords
-            if has_negative and polarity > -0.3:
-                polarity = -0.5
-            if has_positive and polarity < 0.3:
-                polarity = 0.5
-                
-            polarities.append(polarity)
+            polarity = self._sentence_polarity(sentence)
+            for aspect in hits:
+                aspect_sentences[aspect].append(sentence)
+                polarity_sums[aspect] += polarity
         
-        avg_polarity = sum(polarities) / len(polarities)
+        results = []
+        for aspect, sentences in aspect_sentences.items():
+            if sentences:
+                sentiment = self._polarity_label(polarity_sums[aspect] / len(sentences))
+            else:
+                sentiment = 'not mentioned'
+            results.append((aspect, sentiment, tuple(sentences)))
         
-        # More sensitive thresholds
-        if avg_polarity > 0.15:
-            return 'positive'
-        elif avg_polarity < -0.15:
-            return 'negative'
-        else:
-            return 'neutral'
+        return tuple(results)
     
     def extract_aspects(self, text: str) -> Dict[str, Dict]:
         """
@@ -141,22 +221,35 @@ class AspectDetector:
             text: Review text
             
         Returns:
-            Dictionary with aspect analysis
+            Dictionary with aspect analysis (a fresh copy on every call)
         """
-        # Get sentences for each aspect
-        aspect_sentences = self.extract_aspect_sentences(text)
-        
-        # Analyze sentiment for each aspect
-        results = {}
-        for aspect, sentences in aspect_sentences.items():
-            sentiment = self.analyze_aspect_sentiment(sentences)
-            results[aspect] = {
+        return {
+            aspect: {
                 'sentiment': sentiment,
-                'sentences': sentences,
+                'sentences': list(sentences),
                 'mentioned': len(sentences) > 0
             }
+            for aspect, sentiment, sentences in self._analyze_aspects(text)
+        }
+    
+    def detect_batch(self, texts: pd.Series) -> pd.DataFrame:
+        """
+        Detect which aspects each review in a batch mentions
         
-        return results
+        Uses vectorized pandas string matching, so large batches are
+        scanned in C rather than one review at a time in Python.
+        
+        Args:
+            texts: Series (or list) of review texts
+            
+        Returns:
+            DataFrame with one boolean column per aspect, one row per review
+        """
+        texts_lower = pd.Series(texts).str.lower()
+        return pd.DataFrame({
+            aspect: texts_lower.str.contains(pattern, na=False)
+            for aspect, pattern in self.aspect_patterns.items()
+        })
     
     def get_summary(self, text: str) -> Dict[str, str]:
         """
@@ -168,11 +261,10 @@ class AspectDetector:
         Returns:
             Dictionary mapping aspects to sentiments
         """
-        aspects = self.extract_aspects(text)
         return {
-            aspect: data['sentiment'] 
-            for aspect, data in aspects.items()
-            if data['mentioned']
+            aspect: sentiment
+            for aspect, sentiment, sentences in self._analyze_aspects(text)
+            if sentences
         }
 
 
@@ -3,11 +3,107 @@ Cuisine Classification Module
 Classifies reviews into cuisine types based on text content
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from functools import lru_cache
+import ahocorasick
+import numpy as np
+import pandas as pd
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-import pickle
+
+# Hyperscan is optional; it only speeds up batch classification
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Keywords that signal each cuisine
+CUISINE_KEYWORDS = {
+    'Italian': [
+        'pasta', 'pizza', 'spaghetti', 'lasagna', 'risotto', 'gelato',
+        'tiramisu', 'parmigiana', 'carbonara', 'bruschetta', 'gnocchi',
+        'italian', 'marinara', 'alfredo', 'mozzarella', 'parmesan',
+        'fettuccine', 'ravioli'
+    ],
+    'Chinese': [
+        'noodle', 'dumpling', 'wonton', 'fried rice', 'chow mein',
+        'kung pao', 'sweet and sour', 'dim sum', 'chinese', 'szechuan',
+        'cantonese', 'spring roll', 'fortune cookie', 'stir fry', 'soy sauce',
+        'peking duck', 'hot pot'
+    ],
+    'Indian': [
+        'curry', 'naan', 'biryani', 'tandoori', 'masala', 'samosa',
+        'paneer', 'tikka', 'korma', 'vindaloo', 'dal', 'indian',
+        'chapati', 'butter chicken', 'roti', 'chai', 'dosa', 'idli'
+    ],
+    'Mexican': [
+        'taco', 'burrito', 'quesadilla', 'enchilada', 'guacamole',
+        'salsa', 'nachos', 'fajita', 'chimichanga', 'mexican',
+        'tortilla', 'jalapeño', 'margarita', 'cilantro', 'tamale'
+    ],
+    'Japanese': [
+        'sushi', 'sashimi', 'ramen', 'tempura', 'teriyaki', 'miso',
+        'wasabi', 'sake', 'udon', 'japanese', 'hibachi', 'edamame',
+        'bento', 'katsu', 'soba', 'california roll', 'tonkatsu'
+    ],
+    'Korean': [
+        'korean', 'bbq', 'galbi', 'bulgogi', 'kimchi', 'bibimbap',
+        'korean bbq', 'gochujang', 'banchan', 'soju', 'kbbq',
+        'korean fried chicken', 'japchae', 'tteokbokki'
+    ],
+    'American': [
+        'burger', 'fries', 'steak', 'ribs', 'sandwich',
+        'hot dog', 'mac and cheese', 'fried chicken', 'american',
+        'coleslaw', 'milkshake', 'diner', 'breakfast', 'bacon', 'eggs',
+        'wings', 'pulled pork'
+    ],
+    'Thai': [
+        'pad thai', 'tom yum', 'thai', 'coconut', 'lemongrass',
+        'basil', 'peanut sauce', 'mango', 'sticky rice',
+        'green curry', 'red curry', 'papaya salad'
+    ],
+    'Mediterranean': [
+        'hummus', 'falafel', 'kebab', 'gyro', 'shawarma', 'pita',
+        'mediterranean', 'greek', 'olive', 'feta', 'tzatziki', 'lamb',
+        'baba ganoush', 'tabbouleh'
+    ],
+    'Ethiopian': [
+        'ethiopian', 'injera', 'doro wat', 'berbere', 'kitfo',
+        'habesha', 'teff', 'mesob'
+    ],
+    'Brazilian': [
+        'brazilian', 'picanha', 'fogo', 'churrasco', 'pao de queijo',
+        'caipirinha', 'feijoada', 'brigadeiro'
+    ],
+    'Vietnamese': [
+        'pho', 'banh mi', 'vietnamese', 'spring rolls', 'bun',
+        'vermicelli', 'fish sauce', 'lemongrass'
+    ],
+    'French': [
+        'french', 'foie gras', 'escargot', 'croissant', 'crepe',
+        'ratatouille', 'coq au vin', 'bouillabaisse', 'beef wellington'
+    ]
+}
+
+# Explicit cuisine mentions (highest priority when classifying)
+EXPLICIT_MENTIONS = {
+    'korean': 'Korean',
+    'korean bbq': 'Korean',
+    'kbbq': 'Korean',
+    'indian': 'Indian',
+    'italian': 'Italian',
+    'chinese': 'Chinese',
+    'japanese': 'Japanese',
+    'mexican': 'Mexican',
+    'thai': 'Thai',
+    'ethiopian': 'Ethiopian',
+    'brazilian': 'Brazilian',
+    'vietnamese': 'Vietnamese',
+    'french': 'French',
+    'mediterranean': 'Mediterranean',
+    'american': 'American'
+}
 
 
 class CuisineClassifier:
@@ -16,82 +112,89 @@ class CuisineClassifier:
     and machine learning
     """
     
+    __slots__ = (
+        'cuisine_keywords', 'keyword_table', 'keyword_automaton',
+        'keyword_index', 'keyword_weights', 'keyword_database',
+        'explicit_mentions', 'explicit_automaton', 'model', 'vectorizer'
+    )
+    
     def __init__(self):
         """Initialize with cuisine keywords"""
         
-        self.cuisine_keywords = {
-            'Italian': [
-                'pasta', 'pizza', 'spaghetti', 'lasagna', 'risotto', 'gelato',
-                'tiramisu', 'parmigiana', 'carbonara', 'bruschetta', 'gnocchi',
-                'italian', 'marinara', 'alfredo', 'mozzarella', 'parmesan',
-                'fettuccine', 'ravioli'
-            ],
-            'Chinese': [
-                'noodle', 'dumpling', 'wonton', 'fried rice', 'chow mein',
-                'kung pao', 'sweet and sour', 'dim sum', 'chinese', 'szechuan',
-                'cantonese', 'spring roll', 'fortune cookie', 'stir fry', 'soy sauce',
-                'peking duck', 'hot pot'
-            ],
-            'Indian': [
-                'curry', 'naan', 'biryani', 'tandoori', 'masala', 'samosa',
-                'paneer', 'tikka', 'korma', 'vindaloo', 'dal', 'indian',
-                'chapati', 'butter chicken', 'roti', 'chai', 'dosa', 'idli'
-            ],
-            'Mexican': [
-                'taco', 'burrito', 'quesadilla', 'enchilada', 'guacamole',
-                'salsa', 'nachos', 'fajita', 'chimichanga', 'mexican',
-                'tortilla', 'jalapeño', 'margarita', 'cilantro', 'tamale'
-            ],
-            'Japanese': [
-                'sushi', 'sashimi', 'ramen', 'tempura', 'teriyaki', 'miso',
-                'wasabi', 'sake', 'udon', 'japanese', 'hibachi', 'edamame',
-                'bento', 'katsu', 'soba', 'california roll', 'tonkatsu'
-            ],
-            'Korean': [
-                'korean', 'bbq', 'galbi', 'bulgogi', 'kimchi', 'bibimbap',
-                'korean bbq', 'gochujang', 'banchan', 'soju', 'kbbq',
-                'korean fried chicken', 'japchae', 'tteokbokki'
-            ],
-            'American': [
-                'burger', 'fries', 'steak', 'ribs', 'sandwich',
-                'hot dog', 'mac and cheese', 'fried chicken', 'american',
-                'coleslaw', 'milkshake', 'diner', 'breakfast', 'bacon', 'eggs',
-                'wings', 'pulled pork'
-            ],
-            'Thai': [
-                'pad thai', 'tom yum', 'thai', 'coconut', 'lemongrass',
-                'basil', 'peanut sauce', 'mango', 'sticky rice',
-                'green curry', 'red curry', 'papaya salad'
-            ],
-            'Mediterranean': [
-                'hummus', 'falafel', 'kebab', 'gyro', 'shawarma', 'pita',
-                'mediterranean', 'greek', 'olive', 'feta', 'tzatziki', 'lamb',
-                'baba ganoush', 'tabbouleh'
-            ],
-            'Ethiopian': [
-                'ethiopian', 'injera', 'doro wat', 'berbere', 'kitfo',
-                'habesha', 'teff', 'mesob'
-            ],
-            'Brazilian': [
-                'brazilian', 'picanha', 'fogo', 'churrasco', 'pao de queijo',
-                'caipirinha', 'feijoada', 'brigadeiro'
-            ],
-            'Vietnamese': [
-                'pho', 'banh mi', 'vietnamese', 'spring rolls', 'bun',
-                'vermicelli', 'fish sauce', 'lemongrass'
-            ],
-            'French': [
-                'french', 'foie gras', 'escargot', 'croissant', 'crepe',
-                'ratatouille', 'coq au vin', 'bouillabaisse', 'beef wellington'
-            ]
+        # Keyword tables are shared module constants, not rebuilt per instance
+        self.cuisine_keywords = CUISINE_KEYWORDS
+        self.explicit_mentions = EXPLICIT_MENTIONS
+        
+        # Flatten the keyword lists into one table, keyword -> (weight, cuisines);
+        # longer, more specific keywords get a higher weight
+        keyword_cuisines = {}
+        for cuisine, keywords in self.cuisine_keywords.items():
+            for keyword in keywords:
+                keyword_cuisines.setdefault(keyword, []).append(cuisine)
+        self.keyword_table = {
+            keyword: (len(keyword.split()), tuple(cuisines))
+            for keyword, cuisines in keyword_cuisines.items()
         }
         
+        # Compile the table into a single Aho-Corasick automaton so a review
+        # is scanned once, however many keywords there are
+        self.keyword_automaton = ahocorasick.Automaton()
+        for keyword, entry in self.keyword_table.items():
+            self.keyword_automaton.add_word(keyword, (keyword, entry))
+        self.keyword_automaton.make_automaton()
+        
+        # The same table as a dense keyword x cuisine weight matrix, used to
+        # score whole batches of reviews in one vectorized step
+        self.keyword_index = {keyword: i for i, keyword in enumerate(self.keyword_table)}
+        cuisine_index = {cuisine: i for i, cuisine in enumerate(self.cuisine_keywords)}
+        self.keyword_weights = np.zeros((len(self.keyword_table), len(cuisine_index)))
+        for keyword, (weight, cuisines) in self.keyword_table.items():
+            for cuisine in cuisines:
+                self.keyword_weights[self.keyword_index[keyword], cuisine_index[cuisine]] = weight
+        
+        # With Hyperscan, batches are instead scanned against a single
+        # multi-pattern database whose pattern ids are the keyword rows
+        self.keyword_database = None
+        if HYPERSCAN_AVAILABLE:
+            self.keyword_database = hyperscan.Database()
+            self.keyword_database.compile(
+                expressions=[re.escape(k).encode('utf-8') for k in self.keyword_index],
+                ids=list(self.keyword_index.values()),
+                elements=len(self.keyword_index),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(self.keyword_index)
+            )
+        
+        # Explicit mentions get their own automaton
+        self.explicit_automaton = ahocorasick.Automaton()
+        for mention, cuisine in self.explicit_mentions.items():
+            self.explicit_automaton.add_word(mention, (len(mention), cuisine))
+        self.explicit_automaton.make_automaton()
+        
         self.model = None
         self.vectorizer = None
     
+    def _match_keywords(self, text_lower: str) -> Dict[str, Tuple[int, Tuple[str, ...]]]:
+        """Map each distinct keyword found in the text to its weight and cuisines"""
+        return dict(value for _, value in self.keyword_automaton.iter(text_lower))
+    
+    def _explicit_cuisine(self, text_lower: str) -> Optional[str]:
+        """
+        Find the cuisine mentioned by name in the text, if any
+        
+        The earliest mention wins, preferring the longest one starting
+        there so that e.g. "korean bbq" beats "korean".
+        """
+        best_mention = None
+        for end, (length, cuisine) in self.explicit_automaton.iter(text_lower):
+            mention = (end - length, -length, cuisine)
+            if best_mention is None or mention < best_mention:
+                best_mention = mention
+        return best_mention[2] if best_mention is not None else None
+    
+    @lru_cache(maxsize=256)
     def classify_by_keywords(self, text: str) -> Tuple[str, float]:
         """
-        Classify cuisine using keyword matching
+        Classify cuisine using keyword matching (memoized per text)
         
         Args:
             text: Review text
@@ -102,38 +205,15 @@ class CuisineClassifier:
         text_lower = text.lower()
         
         # Check for explicit cuisine mentions first (highest priority)
-        explicit_mentions = {
-            'korean': 'Korean',
-            'korean bbq': 'Korean',
-            'kbbq': 'Korean',
-            'indian': 'Indian',
-            'italian': 'Italian',
-            'chinese': 'Chinese',
-            'japanese': 'Japanese',
-            'mexican': 'Mexican',
-            'thai': 'Thai',
-            'ethiopian': 'Ethiopian',
-            'brazilian': 'Brazilian',
-            'vietnamese': 'Vietnamese',
-            'french': 'French',
-            'mediterranean': 'Mediterranean',
-            'american': 'American'
-        }
-        
-        for mention, cuisine in explicit_mentions.items():
-            if mention in text_lower:
-                return cuisine, 1.0
+        explicit_cuisine = self._explicit_cuisine(text_lower)
+        if explicit_cuisine is not None:
+            return explicit_cuisine, 1.0
         
         # Count keyword matches for each cuisine with weighted scoring
-        scores = {}
-        for cuisine, keywords in self.cuisine_keywords.items():
-            weighted_score = 0
-            for keyword in keywords:
-                if keyword in text_lower:
-                    # Give higher weight to longer, more specific keywords
-                    weight = len(keyword.split())
-                    weighted_score += weight
-            scores[cuisine] = weighted_score
+        scores = dict.fromkeys(self.cuisine_keywords, 0)
+        for weight, cuisines in self._match_keywords(text_lower).values():
+            for cuisine in cuisines:
+                scores[cuisine] += weight
         
         # Get cuisine with highest score
         if max(scores.values()) == 0:
@@ -146,16 +226,6 @@ class CuisineClassifier:
         confidence = scores[best_cuisine] / total_matches if total_matches > 0 else 0
         
         return best_cuisine, confidence
-        if max(scores.values()) == 0:
-            return 'Unknown', 0.0
-        
-        best_cuisine = max(scores, key=scores.get)
-        
-        # Calculate confidence (normalized score)
-        total_matches = sum(scores.values())
-        confidence = scores[best_cuisine] / total_matches if total_matches > 0 else 0
-        
-        return best_cuisine, confidence
     
     def classify(self, text: str) -> Dict[str, any]:
         """
@@ -175,6 +245,80 @@ class CuisineClassifier:
             'method': 'keyword_matching'
         }
     
+    def classify_batch(self, texts: List[str]) -> pd.DataFrame:
+        """
+        Classify multiple reviews
+        
+        Keyword hits are collected as (review, keyword) index pairs (using a
+        Hyperscan database when available) and their weight rows are summed
+        into a review x cuisine score matrix in one vectorized step, instead
+        of summing weights in Python for each review.
+        
+        Args:
+            texts: List of review texts
+            
+        Returns:
+            DataFrame with the same fields as classify, one row per review
+        """
+        cuisine_names = list(self.cuisine_keywords)
+        hit_rows = []
+        hit_keywords = []
+        explicit_cuisines = []
+        
+        def on_match(keyword_id, start, end, flags, row):
+            hit_rows.append(row)
+            hit_keywords.append(keyword_id)
+        
+        # The database's built-in scratch space can only be used by one scan
+        # at a time; a scratch per call keeps concurrent batches (e.g. several
+        # Streamlit sessions sharing one classifier) from colliding
+        scratch = None
+        if self.keyword_database is not None:
+            scratch = hyperscan.Scratch(self.keyword_database)
+        
+        for row, text in enumerate(texts):
+            text_lower = text.lower()
+            explicit_cuisines.append(self._explicit_cuisine(text_lower))
+            if self.keyword_database is not None:
+                self.keyword_database.scan(
+                    text_lower.encode('utf-8'), match_event_handler=on_match,
+                    context=row, scratch=scratch
+                )
+            else:
+                for keyword in self._match_keywords(text_lower):
+                    hit_rows.append(row)
+                    hit_keywords.append(self.keyword_index[keyword])
+        
+        # Only the hits are stored, never a dense review x keyword matrix,
+        # so memory grows with the number of matches rather than keywords
+        scores = np.zeros((len(texts), self.keyword_weights.shape[1]))
+        np.add.at(
+            scores,
+            np.asarray(hit_rows, dtype=np.intp),
+            self.keyword_weights[np.asarray(hit_keywords, dtype=np.intp)]
+        )
+        best = scores.argmax(axis=1)
+        totals = scores.sum(axis=1)
+        best_scores = scores[np.arange(len(texts)), best]
+        
+        results = []
+        for row, explicit_cuisine in enumerate(explicit_cuisines):
+            if explicit_cuisine is not None:
+                cuisine, confidence = explicit_cuisine, 1.0
+            elif totals[row] == 0:
+                cuisine, confidence = 'Unknown', 0.0
+            else:
+                cuisine = cuisine_names[best[row]]
+                confidence = float(best_scores[row] / totals[row])
+            
+            results.append({
+                'cuisine': cuisine,
+                'confidence': round(confidence, 4),
+                'method': 'keyword_matching'
+            })
+        
+        return pd.DataFrame(results, columns=['cuisine', 'confidence', 'method'])
+    
     def get_all_scores(self, text: str) -> Dict[str, int]:
         """
         Get match scores for all cuisines
@@ -185,13 +329,11 @@ class CuisineClassifier:
         Returns:
             Dictionary mapping cuisines to match counts
         """
-        text_lower = text.lower()
-        scores = {}
-        
-        for cuisine, keywords in self.cuisine_keywords.items():
-            count = sum(1 for keyword in keywords if keyword in text_lower)
-            if count > 0:
-                scores[cuisine] = count
+        matches = self._match_keywords(text.lower())
+        counts = Counter(
+            cuisine for _, cuisines in matches.values() for cuisine in cuisines
+        )
+        scores = {cuisine: counts[cuisine] for cuisine in self.cuisine_keywords if cuisine in counts}
         
         # Sort by score
         return dict(sorted(scores.items(), key=lambda x: x[1], reverse=True))
@@ -4,10 +4,129 @@ Extracts entities like dish names, restaurant names, and food items
 """
 
 import spacy
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, Set
+import ahocorasick
 import re
 
 
+# Components of en_core_web_sm that entity extraction never reads; NER only
+# needs the tokenizer and its tok2vec layer
+UNUSED_PIPES = ['tagger', 'parser', 'attribute_ruler', 'lemmatizer']
+
+# Keys of every entity dictionary, in display order
+ENTITY_TYPES = ('dishes', 'restaurants', 'locations', 'people')
+
+# Common Indian dishes
+INDIAN_DISHES = (
+    'butter chicken', 'chicken tikka', 'tandoori chicken', 'chicken curry',
+    'paneer tikka', 'palak paneer', 'dal', 'dal makhani', 'biryani', 
+    'samosa', 'naan', 'garlic naan', 'butter naan', 'roti', 'chapati', 
+    'paratha', 'tikka masala', 'korma', 'vindaloo', 'doro wat', 'injera',
+    'masala dosa', 'idli', 'vada', 'pakora'
+)
+
+# Common dishes from other cuisines
+COMMON_DISHES = (
+    # Italian
+    'pizza', 'margherita pizza', 'pasta', 'spaghetti', 'lasagna', 
+    'fettuccine', 'carbonara', 'alfredo', 'ravioli', 'gnocchi', 'tiramisu',
+    'risotto', 'bruschetta', 'parmigiana',
+    
+    # American
+    'burger', 'cheeseburger', 'impossible burger', 'hot dog', 'fries',
+    'french fries', 'wings', 'buffalo wings', 'ribs', 'pulled pork',
+    'mac and cheese', 'eggs benedict', 'avocado toast', 'milkshake',
+    
+    # Japanese
+    'sushi', 'sashimi', 'ramen', 'tempura', 'teriyaki', 'tonkatsu',
+    'udon', 'soba', 'california roll', 'miso soup', 'edamame',
+    
+    # Mexican
+    'taco', 'fish taco', 'burrito', 'quesadilla', 'enchilada', 
+    'guacamole', 'nachos', 'fajita', 'tamale', 'churro',
+    
+    # Chinese
+    'dumpling', 'fried rice', 'chow mein', 'dim sum', 'wonton',
+    'kung pao chicken', 'sweet and sour', 'peking duck', 'spring roll',
+    
+    # Korean
+    'galbi', 'bulgogi', 'kimchi', 'bibimbap', 'japchae', 'tteokbokki',
+    
+    # Thai
+    'pad thai', 'tom yum', 'green curry', 'red curry', 'papaya salad',
+    
+    # Others
+    'pho', 'banh mi', 'steak', 'filet mignon', 'salad', 'caesar salad',
+    'quinoa salad', 'soup', 'sandwich', 'lobster', 'crab', 'shrimp',
+    'cheesecake', 'foie gras', 'beef wellington', 'pani puri', 'vada pav',
+    'falafel', 'hummus', 'shawarma', 'gyro', 'kebab'
+)
+
+# Every dish keyword the rule-based extractor looks for
+ALL_DISHES = INDIAN_DISHES + COMMON_DISHES
+
+
+def _build_dish_automaton() -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton over every dish keyword"""
+    automaton = ahocorasick.Automaton()
+    for dish in ALL_DISHES:
+        automaton.add_word(dish, dish)
+    automaton.make_automaton()
+    return automaton
+
+
+# Built once at import and shared by every EntityRecognizer
+DISH_AUTOMATON = _build_dish_automaton()
+
+# Known food words to filter out false person detections
+FOOD_INDICATORS = frozenset([
+    'naan', 'chicken', 'curry', 'biryani', 'tikka', 'paneer',
+    'pizza', 'pasta', 'burger', 'sushi', 'taco', 'rice', 'bread',
+    'salad', 'soup', 'fish', 'beef', 'pork', 'lamb'
+])
+
+# Finds any food indicator inside an entity in a single scan
+_FOOD_RE = re.compile('|'.join(map(re.escape, sorted(FOOD_INDICATORS))))
+
+# Words that are NOT people names
+FALSE_NAMES = frozenset(['rich', 'fresh', 'hot', 'cold', 'sweet', 'spicy', 'mild', 'tender'])
+
+# Common words to exclude from cleaned entities
+STOPWORDS = frozenset([
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at',
+    'very', 'good', 'great', 'best', 'nice', 'amazing'
+])
+
+# Loaded pipelines, shared by every EntityRecognizer in the process
+_NLP_CACHE: Dict[tuple, spacy.language.Language] = {}
+
+
+def _get_nlp(name: str, exclude: Iterable[str] = ()) -> spacy.language.Language:
+    """Load a spaCy pipeline once per (name, excluded components)"""
+    # Materialize once: a generator would be used up by the cache key
+    exclude = tuple(exclude)
+    key = (name, tuple(sorted(exclude)))
+    nlp = _NLP_CACHE.get(key)
+    if nlp is None:
+        nlp = spacy.load(name, exclude=list(exclude))
+        _NLP_CACHE[key] = nlp
+    return nlp
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end + 1] is not part of a longer word"""
+    return ((start == 0 or not text[start - 1].isalnum()) and
+            (end + 1 == len(text) or not text[end + 1].isalnum()))
+
+
+def _dedup_ci(items: Iterable[str]) -> List[str]:
+    """Drop case-insensitive duplicates, keeping the first spelling seen"""
+    seen = {}
+    for item in items:
+        seen.setdefault(item.lower(), item)
+    return list(seen.values())
+
+
 class EntityRecognizer:
     """
     Extract named entities from restaurant reviews
@@ -16,18 +135,37 @@ class EntityRecognizer:
     def __init__(self):
         """Initialize NER with spaCy"""
         try:
-            self.nlp = spacy.load('en_core_web_sm')
+            # Excluded components are not even loaded from disk
+            self.nlp = _get_nlp('en_core_web_sm', exclude=UNUSED_PIPES)
             self.spacy_available = True
-        except:
-            print("⚠️  spaCy model not found. Install with: python -m spacy download en_core_web_sm")
+        except (OSError, ImportError) as e:
+            print(f"⚠️  spaCy model load failed: {e!r}")
+            print("   Install with: python -m spacy download en_core_web_sm")
             self.spacy_available = False
         
         # Common dish patterns for fallback
         self.dish_patterns = [
-            r'\b[A-Z][a-z]+ [A-Z][a-z]+\b',  # e.g., Butter Chicken
-            r'\b[A-Z][a-z]+ [a-z]+ [A-Z][a-z]+\b'  # e.g., Pad Thai Special
+            re.compile(r'\b[A-Z][a-z]+ [A-Z][a-z]+\b'),  # e.g., Butter Chicken
+            re.compile(r'\b[A-Z][a-z]+ [a-z]+ [A-Z][a-z]+\b')  # e.g., Pad Thai Special
         ]
     
+    def pipe(self, texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> Iterator:
+        """
+        Parse many reviews with a single batched spaCy call
+        
+        Args:
+            texts: Review texts
+            batch_size: Number of texts spaCy buffers per batch
+            n_process: Number of worker processes (multiprocessing usually
+                only pays off for large batches)
+            
+        Returns:
+            Iterator of spaCy Docs, in the same order as the texts
+        """
+        return self.nlp.pipe(
+            texts, batch_size=batch_size, n_process=n_process, disable=UNUSED_PIPES
+        )
+    
     def extract_with_spacy(self, text: str) -> Dict[str, List[str]]:
         """
         Extract entities using spaCy NER
@@ -41,60 +179,48 @@ class EntityRecognizer:
         if not self.spacy_available:
             return self.extract_with_rules(text)
         
-        doc = self.nlp(text)
-        
-        entities = {
-            'dishes': [],
-            'restaurants': [],
-            'locations': [],
-            'people': []
-        }
-        
-        # Known food words to filter out false person detections
-        food_indicators = ['naan', 'chicken', 'curry', 'biryani', 'tikka', 'paneer', 
-                          'pizza', 'pasta', 'burger', 'sushi', 'taco', 'rice', 'bread',
-                          'salad', 'soup', 'fish', 'beef', 'pork', 'lamb']
+        return self._entities_from_doc(self.nlp(text), text)
+    
+    def _entities_from_doc(self, doc, text: str) -> Dict[str, List[str]]:
+        """
+        Collect entities from an already parsed spaCy Doc
         
-        # Words that are NOT people names
-        false_names = ['rich', 'fresh', 'hot', 'cold', 'sweet', 'spicy', 'mild', 'tender']
+        Args:
+            doc: spaCy Doc for the review
+            text: Review text the Doc was parsed from
+            
+        Returns:
+            Dictionary with entity types and values
+        """
+        dishes, restaurants, locations, people = [], [], [], []
         
         for ent in doc.ents:
-            ent_lower = ent.text.lower()
+            # Span.text and Span.label_ build new strings on every access
+            ent_text = ent.text
+            label = ent.label_
             
             # Check if "person" entity is actually a food item or false positive
-            if ent.label_ == 'PERSON':
-                is_food = any(food in ent_lower for food in food_indicators)
-                is_false_name = ent_lower in false_names
+            if label == 'PERSON':
+                ent_lower = ent_text.lower()
+                is_food = _FOOD_RE.search(ent_lower) is not None
+                is_false_name = ent_lower in FALSE_NAMES
                 
                 if is_food:
-                    entities['dishes'].append(ent.text)
-                elif not is_false_name and len(ent.text) > 2:
-                    entities['people'].append(ent.text)
-            elif ent.label_ == 'ORG':
-                entities['restaurants'].append(ent.text)
-            elif ent.label_ == 'GPE':
-                entities['locations'].append(ent.text)
-            elif ent.label_ in ['PRODUCT', 'FOOD']:
-                entities['dishes'].append(ent.text)
-        
-        # Remove duplicates
-        entities = {k: list(set(v)) for k, v in entities.items()}
+                    dishes.append(ent_text)
+                elif not is_false_name and len(ent_text) > 2:
+                    people.append(ent_text)
+            elif label == 'ORG':
+                restaurants.append(ent_text)
+            elif label == 'GPE':
+                locations.append(ent_text)
+            elif label in ('PRODUCT', 'FOOD'):
+                dishes.append(ent_text)
         
         # Add rule-based dish extraction (prioritize this)
-        rule_dishes = self.extract_dishes_by_rules(text)
-        entities['dishes'].extend(rule_dishes)
-        
-        # Remove duplicates (case-insensitive)
-        seen = set()
-        unique_dishes = []
-        for dish in entities['dishes']:
-            dish_lower = dish.lower()
-            if dish_lower not in seen:
-                seen.add(dish_lower)
-                unique_dishes.append(dish)
-        entities['dishes'] = unique_dishes
+        dishes.extend(self.extract_dishes_by_rules(text))
         
-        return entities
+        # Remove duplicates (case-insensitive) in one pass per type
+        return dict(zip(ENTITY_TYPES, map(_dedup_ci, (dishes, restaurants, locations, people))))
     
     def extract_dishes_by_rules(self, text: str) -> List[str]:
         """
@@ -106,70 +232,18 @@ class EntityRecognizer:
         Returns:
             List of potential dish names
         """
-        dishes = set()
-        
-        # Common Indian dishes
-        indian_dishes = [
-            'butter chicken', 'chicken tikka', 'tandoori chicken', 'chicken curry',
-            'paneer tikka', 'palak paneer', 'dal', 'dal makhani', 'biryani', 
-            'samosa', 'naan', 'garlic naan', 'butter naan', 'roti', 'chapati', 
-            'paratha', 'tikka masala', 'korma', 'vindaloo', 'doro wat', 'injera',
-            'masala dosa', 'idli', 'vada', 'pakora'
-        ]
-        
-        # Common dishes from other cuisines
-        common_dishes = [
-            # Italian
-            'pizza', 'margherita pizza', 'pasta', 'spaghetti', 'lasagna', 
-            'fettuccine', 'carbonara', 'alfredo', 'ravioli', 'gnocchi', 'tiramisu',
-            'risotto', 'bruschetta', 'parmigiana',
-            
-            # American
-            'burger', 'cheeseburger', 'impossible burger', 'hot dog', 'fries',
-            'french fries', 'wings', 'buffalo wings', 'ribs', 'pulled pork',
-            'mac and cheese', 'eggs benedict', 'avocado toast', 'milkshake',
-            
-            # Japanese
-            'sushi', 'sashimi', 'ramen', 'tempura', 'teriyaki', 'tonkatsu',
-            'udon', 'soba', 'california roll', 'miso soup', 'edamame',
-            
-            # Mexican
-            'taco', 'fish taco', 'burrito', 'quesadilla', 'enchilada', 
-            'guacamole', 'nachos', 'fajita', 'tamale', 'churro',
-            
-            # Chinese
-            'dumpling', 'fried rice', 'chow mein', 'dim sum', 'wonton',
-            'kung pao chicken', 'sweet and sour', 'peking duck', 'spring roll',
-            
-            # Korean
-            'galbi', 'bulgogi', 'kimchi', 'bibimbap', 'japchae', 'tteokbokki',
-            
-            # Thai
-            'pad thai', 'tom yum', 'green curry', 'red curry', 'papaya salad',
-            
-            # Others
-            'pho', 'banh mi', 'steak', 'filet mignon', 'salad', 'caesar salad',
-            'quinoa salad', 'soup', 'sandwich', 'lobster', 'crab', 'shrimp',
-            'cheesecake', 'foie gras', 'beef wellington', 'pani puri', 'vada pav',
-            'falafel', 'hummus', 'shawarma', 'gyro', 'kebab'
-        ]
-        
-        # Combine all dish keywords
-        all_dishes = indian_dishes + common_dishes
-        
         text_lower = text.lower()
         
-        # Extract dishes by exact keyword matching only
-        for dish in all_dishes:
-            if f' {dish} ' in f' {text_lower} ' or text_lower.startswith(dish) or text_lower.endswith(dish):
-                dishes.add(dish.title())
-        
-        # Return cleaned list
-        return list(dishes)[:10]  # Limit to top 10 dishes
+        # One pass over the text finds every dish keyword; keep only the
+        # occurrences that stand as whole words
+        dishes = [
+            dish.title()
+            for end, dish in DISH_AUTOMATON.iter(text_lower)
+            if _is_whole_word(text_lower, end - len(dish) + 1, end)
+        ]
         
-        # Remove duplicates and clean
-        dishes = [d.strip() for d in dishes if len(d.split()) <= 4]
-        return list(set(dishes))[:10]  # Limit to top 10
+        # Remove duplicates, keeping the order dishes appear in the review
+        return list(dict.fromkeys(dishes))[:10]  # Limit to top 10 dishes
     
     def extract_with_rules(self, text: str) -> Dict[str, List[str]]:
         """
@@ -181,12 +255,8 @@ class EntityRecognizer:
         Returns:
             Dictionary with extracted entities
         """
-        entities = {
-            'dishes': self.extract_dishes_by_rules(text),
-            'restaurants': [],
-            'locations': [],
-            'people': []
-        }
+        entities = {entity_type: [] for entity_type in ENTITY_TYPES}
+        entities['dishes'] = self.extract_dishes_by_rules(text)
         
         return entities
     
@@ -210,20 +280,41 @@ class EntityRecognizer:
         
         return entities
     
+    def extract_entities_batch(
+        self, texts: List[str], batch_size: int = 64, n_process: int = 1
+    ) -> List[Dict[str, List[str]]]:
+        """
+        Extract entities from multiple reviews
+        
+        Reviews are parsed together with nlp.pipe rather than one nlp()
+        call each, which amortizes spaCy's per-call overhead.
+        
+        Args:
+            texts: List of review texts
+            batch_size: Number of texts spaCy buffers per batch
+            n_process: Number of spaCy worker processes
+            
+        Returns:
+            List of entity dictionaries, one per review, as extract_entities
+        """
+        if not self.spacy_available:
+            return [self.extract_entities(text) for text in texts]
+        
+        texts = list(texts)
+        docs = self.pipe(texts, batch_size=batch_size, n_process=n_process)
+        return [
+            self._clean_entities(self._entities_from_doc(doc, text))
+            for doc, text in zip(docs, texts)
+        ]
+    
     def _clean_entities(self, entities: Dict[str, List[str]]) -> Dict[str, List[str]]:
         """Clean and filter extracted entities"""
-        # Common words to exclude
-        stopwords = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at',
-            'very', 'good', 'great', 'best', 'nice', 'amazing'
-        }
-        
         cleaned = {}
         for entity_type, entity_list in entities.items():
             # Remove stopwords and short entities
             filtered = [
-                e for e in entity_list 
-                if e.lower() not in stopwords and len(e) > 2
+                e for e in entity_list
+                if len(e) > 2 and e.lower() not in STOPWORDS
             ]
             cleaned[entity_type] = filtered[:10]  # Limit to 10 per type
         
@@ -3,8 +3,10 @@ Sentiment Analysis Module
 Analyzes the overall sentiment of restaurant reviews
 """
 
-from textblob import TextBlob
+from functools import lru_cache
+from textblob.en import sentiment as pattern_sentiment
 from typing import Dict, Tuple
+import numpy as np
 import pandas as pd
 
 # Try to import transformers, but make it optional
@@ -15,6 +17,9 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
     print("⚠️  transformers library not installed. Using TextBlob for sentiment analysis.")
 
+# Every label analyze() can return
+SENTIMENT_LABELS = ['positive', 'negative', 'neutral']
+
 
 class SentimentAnalyzer:
     """
@@ -38,9 +43,12 @@ class SentimentAnalyzer:
                 self.method = 'textblob'
             else:
                 print("Loading transformer model... (this may take a moment)")
+                # The tokenizer cuts long reviews to BERT's 512-token limit
                 self.model = pipeline(
                     "sentiment-analysis",
-                    model="distilbert-base-uncased-finetuned-sst-2-english"
+                    model="distilbert-base-uncased-finetuned-sst-2-english",
+                    truncation=True,
+                    max_length=512
                 )
                 print("✅ Model loaded successfully!")
     
@@ -54,8 +62,9 @@ class SentimentAnalyzer:
         Returns:
             Tuple of (sentiment_label, polarity_score)
         """
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
+        # TextBlob's default analyzer is this lexicon scorer; calling it
+        # directly skips building a TextBlob for every review
+        polarity = pattern_sentiment(text)[0]
         
         # More nuanced sentiment classification
         if polarity > 0.3:
@@ -88,17 +97,31 @@ class SentimentAnalyzer:
         Returns:
             Tuple of (sentiment_label, confidence_score)
         """
-        # Truncate text if too long (BERT limit is 512 tokens)
-        max_length = 512
-        if len(text.split()) > max_length:
-            text = ' '.join(text.split()[:max_length])
-        
         result = self.model(text)[0]
         sentiment = result['label'].lower()  # POSITIVE or NEGATIVE
         score = result['score']
         
         return sentiment, score
     
+    @lru_cache(maxsize=1024)
+    def _analyze_cached(self, text: str) -> Tuple[str, float]:
+        """
+        Run the configured model on a review (memoized per analyzer and text)
+        
+        Args:
+            text: Review text
+            
+        Returns:
+            Tuple of (sentiment_label, score)
+        """
+        if self.method == 'textblob':
+            return self.analyze_textblob(text)
+        return self.analyze_transformer(text)
+    
+    def clear_cache(self):
+        """Drop memoized predictions (the cache is shared by all analyzers)"""
+        SentimentAnalyzer._analyze_cached.cache_clear()
+    
     def analyze(self, text: str) -> Dict[str, any]:
         """
         Main analysis method
@@ -109,10 +132,7 @@ class SentimentAnalyzer:
         Returns:
             Dictionary with sentiment, score, and details
         """
-        if self.method == 'textblob':
-            sentiment, score = self.analyze_textblob(text)
-        else:
-            sentiment, score = self.analyze_transformer(text)
+        sentiment, score = self._analyze_cached(text)
         
         return {
             'sentiment': sentiment,
@@ -130,12 +150,24 @@ class SentimentAnalyzer:
         Returns:
             DataFrame with results
         """
-        results = []
-        for text in texts:
-            result = self.analyze(text)
-            results.append(result)
+        if self.method == 'transformer':
+            # Hand the whole list to the pipeline so it tokenizes and runs
+            # the model on padded batches instead of one review at a time
+            outputs = self.model(list(texts), batch_size=32)
+            sentiments = [output['label'].lower() for output in outputs]
+            scores = [output['score'] for output in outputs]
+        else:
+            # TextBlob is pure Python, so threads would only contend for the GIL
+            predictions = [self._analyze_cached(text) for text in texts]
+            sentiments = [sentiment for sentiment, _ in predictions]
+            scores = [score for _, score in predictions]
         
-        return pd.DataFrame(results)
+        # Build typed columns directly instead of inferring them from records
+        return pd.DataFrame({
+            'sentiment': pd.Categorical(sentiments, categories=SENTIMENT_LABELS),
+            'confidence': np.round(np.asarray(scores, dtype=np.float64), 4).astype(np.float32),
+            'method': pd.Categorical([self.method] * len(sentiments), categories=[self.method])
+        })
 
 
 def get_sentiment_emoji(sentiment: str) -> str:
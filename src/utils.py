@@ -9,6 +9,15 @@ from typing import List, Dict
 import pandas as pd
 
 
+# Patterns used on every review, compiled once at import
+_URL_RE = re.compile(r'http\S+|www\S+|https\S+')
+_EMAIL_RE = re.compile(r'\S+@\S+')
+_SENT_RE = re.compile(r'[.!?]+')
+
+# Translation table that deletes ASCII punctuation
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+
 def clean_text(text: str) -> str:
     """
     Clean and preprocess text data
@@ -22,16 +31,20 @@ def clean_text(text: str) -> str:
     # Convert to lowercase
     text = text.lower()
     
-    # Expand contractions (don't -> do not)
+    # Expand contractions (don't -> do not). This is not guarded by an
+    # apostrophe check: slang such as "dont", "im" and "wanna" expands too
     text = contractions.fix(text)
     
-    # Remove URLs
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text)
-    
-    # Remove email addresses
-    text = re.sub(r'\S+@\S+', '', text)
+    # Remove URLs and email addresses; a plain substring test is much
+    # cheaper than a regex pass over a review that has neither
+    if 'http' in text or 'www' in text:
+        text = _URL_RE.sub('', text)
+    if '@' in text:
+        text = _EMAIL_RE.sub('', text)
     
-    # Remove extra whitespace
+    # Remove extra whitespace. split/join is deliberate: a compiled \s+
+    # substitution is several times slower, since it emits a replacement
+    # for every single gap between words
     text = ' '.join(text.split())
     
     return text.strip()
@@ -39,7 +52,7 @@ def clean_text(text: str) -> str:
 
 def remove_punctuation(text: str) -> str:
     """Remove punctuation from text"""
-    return text.translate(str.maketrans('', '', string.punctuation))
+    return text.translate(_PUNCT_TABLE)
 
 
 def get_rating_category(rating: float) -> str:
@@ -71,7 +84,7 @@ def extract_sentences(text: str) -> List[str]:
         List of sentences
     """
     # Simple sentence splitting (can be improved with spaCy)
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENT_RE.split(text)
     return [s.strip() for s in sentences if s.strip()]
 
 
@@ -27,3 +27,38 @@ for review, expected in test_reviews:
     status = "✅" if result['cuisine'] == expected else "❌"
     print(f"\n{status} Review: {review[:50]}...")
     print(f"   Expected: {expected} | Got: {result['cuisine']} ({result['confidence']:.1%})")
+
+print("\n" + "="*60)
+print("TESTING BATCH CLASSIFICATION")
+print("="*60)
+
+import threading
+
+reviews = [review for review, _ in test_reviews] + ["The food was fine.", ""]
+expected_rows = [classifier.classify(review) for review in reviews]
+
+batch = classifier.classify_batch(reviews)
+status = "✅" if batch.to_dict('records') == expected_rows else "❌"
+print(f"\n{status} classify_batch matches classify row for row ({len(batch)} reviews)")
+
+# The app shares one classifier across Streamlit sessions, each on its own thread
+errors = []
+
+def classify_concurrently():
+    try:
+        for _ in range(20):
+            if classifier.classify_batch(reviews).to_dict('records') != expected_rows:
+                errors.append("batch result mismatch")
+    except Exception as e:
+        errors.append(repr(e))
+
+threads = [threading.Thread(target=classify_concurrently) for _ in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+status = "✅" if not errors else "❌"
+print(f"{status} classify_batch from 8 threads at once ({len(errors)} errors)")
+if errors:
+    print(f"   First error: {errors[0]}")